@@ -10,105 +10,484 @@ correctly sized file. It now processes all files found in an input directory.
 import os
 import sys
 import argparse
+import errno
 import logging
+import mmap
+import struct
 from pathlib import Path
-import io
+from array import array
+import collections
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import fcntl
+except ImportError: # Windows
+    fcntl = None
+
+try:
+    import _cr3_native # Optional Cython atom walker, see _cr3_native.pyx
+except ImportError:
+    _cr3_native = None
 
 MB = 1024 * 1024
+COPY_BUFSIZE = 128 * 1024 # Userspace copy buffer, sized to stay cache resident
+PREFETCH_SIZE = 64 * MB # Leading region prefetched before walking the atom headers
+MAX_PENDING_SAVES = 2 # Parsed files waiting for or being saved in single-process mode
+
+# BMFF atom headers are always big-endian: 32-bit size + 4 byte name,
+# optionally followed by a 64-bit extended size
+_HDR = struct.Struct('>I4s')
+_EXT = struct.Struct('>Q')
+
+# FICLONE ioctl (linux/fs.h): share the source extents copy-on-write (reflink)
+_FICLONE = getattr(fcntl, 'FICLONE', 0x40049409) if fcntl and sys.platform.startswith('linux') else None
 
 # --- Core Logic for Atom Parsing ---
 
-def CR3_atoms(file, endianess="big"):
+def CR3_atoms(buf, pos=0):
     """
-    Generator that scans a binary file stream for CR3 atoms (boxes)
+    Generator that scans a memory-mapped CR3 buffer for atoms (boxes)
     and yields their starting position, name (tag), and total size (header + data).
-    This logic walks the file structure based on reported atom sizes.
+    This logic walks the file structure based on reported atom sizes,
+    reading header fields straight from the mapped bytes (no seeks, no reads).
+    Sizes that are smaller than the atom header or reach past the end of the
+    buffer (corrupted or crafted input) end the walk.
     """
-    assert file.seekable()
+    with memoryview(buf) as mv:
+        end = len(mv)
 
-    while True:
-        pos = file.tell()
+        # Each atom needs at least an 8 byte header (size + name)
+        while pos + 8 <= end:
+            # 1. Atom Size (4 bytes) and Name (4 bytes)
+            size, name = _HDR.unpack_from(mv, pos)
+            header_size = 8
 
-        # 1. Read Atom Size (4 bytes)
-        size_bytes = file.read(4)
-        if len(size_bytes) < 4:  # End of file or incomplete read
-            break
+            # 2. Handle 64-bit size extension (size == 1)
+            if size == 1:
+                # The actual size is in the next 8 bytes
+                if pos + 16 > end:
+                    break
+                size, = _EXT.unpack_from(mv, pos + 8)
+                header_size = 16
 
-        # 2. Read Atom Name (4 bytes)
-        name = file.read(4)
-        if len(name) < 4:
-            break
+            if size < header_size or pos + size > end:
+                # Invalid size reported (no progress, or past the end of the file), stop parsing
+                break
 
-        # Decode size
-        size = int.from_bytes(size_bytes, endianess)
+            yield (pos, name, size)
 
-        # 3. Handle 64-bit size extension (size == 1)
-        if size == 1:
-            # The actual size is in the next 8 bytes
-            size_ext_bytes = file.read(8)
-            if len(size_ext_bytes) < 8:
-                 break
-            size = int.from_bytes(size_ext_bytes, endianess)
-        
-        if size <= 0:
-             # Invalid or empty size reported, stop parsing
-             break
+            # 3. Jump to the next atom: (current_pos + total_size)
+            pos += size
 
-        yield (pos, name, size)
 
-        # 4. Jump to the next atom: seek to (current_pos + total_size)
-        file.seek(pos + size)
+def cr3_scan(buf, start=0, stop=None):
+    """
+    Walks the CR3 atoms once and materializes them as a Structure-of-Arrays
+    table: packed offsets and sizes (array 'Q', no per-element Python objects)
+    and a parallel list of names, all indexed by atom number.
+    The walk begins at offset 'start' and ends after the first atom named
+    'stop', if given.
+
+    Returns:
+        tuple: (offsets, sizes, names)
+    """
+    offsets, sizes, names = array('Q'), array('Q'), []
+    for pos, name, size in CR3_atoms(buf, start):
+        offsets.append(pos)
+        sizes.append(size)
+        names.append(name)
+        if name == stop:
+            break
+    return offsets, sizes, names
 
 
 # --- Size Calculation Function ---
 
-def CR3_size(file_handle, last_chunk_name=b'mdat', endianess="big", log=None):
+def CR3_size(buf, last_chunk_name=b'mdat', log=None, start=0):
     """
     Calculates the total size of the CR3 file by summing atom sizes
     until the termination condition is met (defaulting to the 'mdat' atom).
 
     Args:
-        file_handle (file object): An open file object positioned at the start of the CR3 file.
+        buf (mmap or bytes-like): The mapped contents of the CR3 file.
         last_chunk_name (bytes): The name of the final atom to include (e.g., b'mdat').
-        endianess (str): Endianness for reading size fields.
         log (logger): Logging object for output messages.
+        start (int): Offset of the CR3 file within the buffer (e.g., in a carved disk image).
 
     Returns:
         int: The total calculated size of the file in bytes, or 0 if invalid structure.
     """
-    total_size = 0
-    
-    # Store initial position in case we need to rewind
-    initial_pos = file_handle.tell()
+    # Decide once whether per-atom debug output is wanted instead of formatting it for every atom
+    debug = log is not None and log.isEnabledFor(logging.DEBUG)
 
-    # Iterate through atoms starting from the current file position
-    for index, (offset, name, size) in enumerate(CR3_atoms(file_handle, endianess)):
-        
-        # Rule 1: Must start with the ftyp atom
-        if index == 0 and name != b'ftyp':
+    # The native walker has no per-atom output, so keep the Python walker for DEBUG
+    if _cr3_native is not None and not debug:
+        total_size = _cr3_native.cr3_size(buf, last_chunk_name, start)
+        if total_size:
             if log:
-                log.error(f"Invalid start atom: {name.decode('utf-8', 'ignore')}. Expected b'ftyp'")
-            file_handle.seek(initial_pos) # Rewind on failure
-            return 0
-
-        total_size += size
+                log.info("Termination atom '%s' reached. Logical size found: %s B",
+                         last_chunk_name.decode('utf-8', 'ignore'), format(total_size, ',d'))
+            return total_size
+        # Invalid structure: walk again in Python to report why
 
+    # Rule 1: Must start with the ftyp atom; checked on the first header before scanning anything
+    first_name = bytes(buf[start + 4:start + 8])
+    if len(first_name) == 4 and first_name != b'ftyp':
         if log:
-            log.debug(f"Atom index={index}, name={name.decode('utf-8', 'ignore')}, size={size:,d}")
+            log.error("Invalid start atom: %r. Expected b'ftyp'", first_name)
+        return 0
 
-        # Rule 2: Termination condition (e.g., reaching 'mdat')
-        if name == last_chunk_name:
-            if log:
-                log.info(f"Termination atom '{name.decode('utf-8', 'ignore')}' reached. Logical size found: {total_size:,d} B")
-            file_handle.seek(initial_pos) # Rewind before returning
-            return total_size
+    # Scan the atoms starting from the beginning of the file, up to the termination atom
+    offsets, sizes, names = cr3_scan(buf, start=start, stop=last_chunk_name)
+
+    if debug:
+        for index, (name, size) in enumerate(zip(names, sizes)):
+            log.debug("Atom index=%d, name=%r, size=%d", index, name, size)
+
+    # Rule 2: Termination condition (e.g., reaching 'mdat'); the scan ends on it when found
+    if names and names[-1] == last_chunk_name:
+        total_size = sum(sizes)
+        if log:
+            log.info("Termination atom '%s' reached. Logical size found: %s B",
+                     last_chunk_name.decode('utf-8', 'ignore'), format(total_size, ',d'))
+        return total_size
 
     if log:
-        log.warning(f"File ended before reaching termination atom '{last_chunk_name.decode('utf-8', 'ignore')}'. Returning 0.")
-    file_handle.seek(initial_pos) # Rewind before returning
+        # The walk stops either at the end of the file or on a header whose size it rejected
+        next_pos = offsets[-1] + sizes[-1] if names else start
+        if next_pos + 8 <= len(buf):
+            log.warning("Atom %r at offset %s has an invalid size (smaller than its header or past the end of the file)"
+                        " before reaching termination atom '%s'. Returning 0.",
+                        bytes(buf[next_pos + 4:next_pos + 8]), format(next_pos, ',d'),
+                        last_chunk_name.decode('utf-8', 'ignore'))
+        else:
+            log.warning("File ended before reaching termination atom '%s'. Returning 0.",
+                        last_chunk_name.decode('utf-8', 'ignore'))
     return 0
 
 
+# --- Per-File Processing ---
+
+class FileLogAdapter(logging.LoggerAdapter):
+    """Prefixes messages with the name of the file being processed, so interleaved worker output stays attributable."""
+    def process(self, msg, kwargs):
+        # Escape '%' in the name: the prefixed message is still %-formatted with its arguments
+        return f"{self.extra['name'].replace('%', '%%')}: {msg}", kwargs
+
+
+def restore(infile, output_path, offset, size, log, force_copy=False):
+    """
+    Reads 'size' bytes starting from 'offset' and writes to the output file.
+    Unless 'force_copy' is set, the data is shared with the input file via a
+    copy-on-write clone where the filesystem supports it.
+
+    Returns:
+        bool: True if the file was completely written and renamed into place.
+    """
+    path = output_path
+    log.info("Saving %s, calculated size %s B", path.name, format(size, ',d'))
+
+    # Use a temporary file first for robust (atomic) write;
+    # exclusive creation never clobbers a temp file another run is still writing
+    tmp = Path(str(path) + ".tmp")
+    try:
+        out = tmp.open('xb')
+    except FileExistsError:
+        log.error("Temporary file %s already exists: skipping %s. Remove it if no other run is active.", tmp.name, path.name)
+        return False
+
+    try:
+        with out:
+            # Let the kernel move the bytes first; fall back to a userspace loop
+            # for whatever it could not copy (unsupported platform or filesystem)
+            if (not force_copy and offset == 0
+                    and os.fstat(infile.fileno()).st_size >= size
+                    and _clone_file(infile, out, size, log)):
+                copied = size
+            else:
+                _preallocate(out, size, log)
+                copied = _kernel_copy(infile, out, offset, size, log, allow_reflink=not force_copy)
+            bytes_remaining = size - copied
+            if copied:
+                # Resync the buffered writer with the fd (not SEEK_END: the file may be preallocated)
+                out.seek(copied)
+
+            # Positional reads track 'pos' locally: no seek, and the file position is left alone
+            pos = offset + copied
+            use_pread = hasattr(os, 'preadv')
+            if not use_pread:
+                infile.seek(pos)
+
+            # Reuse a single buffer instead of allocating a new bytes object per chunk
+            buf = memoryview(bytearray(COPY_BUFSIZE)) if bytes_remaining > 0 else None
+            while bytes_remaining > 0:
+                chunk = buf if bytes_remaining >= COPY_BUFSIZE else buf[:bytes_remaining]
+                n = os.preadv(infile.fileno(), [chunk], pos) if use_pread else infile.readinto(chunk)
+
+                if not n:
+                    log.error("Premature EOF encountered while reading %s B for %s", format(size, ',d'), path.name)
+                    break
+
+                out.write(buf[:n])
+                pos += n
+                bytes_remaining -= n
+
+            # The output is not read back: start its writeback and drop it from the page cache
+            out.flush()
+            _fadvise(out.fileno(), 0, 0, 'POSIX_FADV_DONTNEED')
+
+        if bytes_remaining == 0:
+            # Move temp file to final path on successful write; an existing output is never replaced
+            try:
+                _publish(tmp, path)
+            except FileExistsError:
+                log.warning("%s already exists: skipping save attempt.", path.name)
+                return False
+            log.info("[SUCCESS] File successfully fixed and saved to %s", path.name)
+            return True
+        else:
+            log.error("[ERROR] Incomplete save for %s. Saved only %s bytes.", path.name, format(size - bytes_remaining, ',d'))
+
+    except Exception as e:
+        log.critical("Error restoring file %s: %s", path.name, e)
+    finally:
+        # Clean up the temp file whenever it was not published, including on
+        # KeyboardInterrupt, so an interrupted save never blocks later runs
+        if tmp.exists():
+            os.remove(tmp)
+    return False
+
+
+def _publish(tmp, path):
+    """
+    Gives the finished temp file its final name. os.link() fails atomically
+    with FileExistsError if 'path' already exists, so unlike a rename it can
+    never overwrite an output. Filesystems without hard links (e.g. FAT/exFAT
+    memory cards) fall back to a rename.
+    """
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        raise
+    except OSError:
+        tmp.rename(path)
+        return
+    os.remove(tmp)
+
+
+def _clone_file(infile, out, size, log):
+    """
+    Turns out into a copy-on-write clone of infile truncated to 'size' bytes,
+    so no data is copied on filesystems with reflink support (btrfs, XFS, ...).
+    Unlike a hard link the clone has its own inode: the input file is untouched.
+    Returns True on success.
+    """
+    if _FICLONE is None:
+        return False
+    try:
+        fcntl.ioctl(out.fileno(), _FICLONE, infile.fileno())
+    except OSError as e:
+        log.debug("Reflink clone unavailable for %s (%s), copying", out.name, errno.errorcode.get(e.errno, e.errno))
+        return False
+    out.truncate(size)
+    return True
+
+
+def _find_fallocate():
+    """
+    Returns a native preallocation function taking (fd, length), or None.
+
+    On Linux this is fallocate(2) called through ctypes: glibc's
+    posix_fallocate() silently emulates preallocation on filesystems without
+    native support (FAT/exFAT, many FUSE mounts) by writing every block, which
+    would add a full extra write pass, whereas fallocate(2) fails there with
+    EOPNOTSUPP. Other platforms' posix_fallocate() does not emulate.
+    """
+    if not sys.platform.startswith('linux'):
+        if hasattr(os, 'posix_fallocate'):
+            return lambda fd, length: os.posix_fallocate(fd, 0, length)
+        return None
+
+    try:
+        import ctypes
+        libc = ctypes.CDLL(None, use_errno=True)
+        func = getattr(libc, 'fallocate64', None) or libc.fallocate
+    except (ImportError, OSError, AttributeError):
+        return None
+    func.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64)
+    func.restype = ctypes.c_int
+
+    def fallocate(fd, length):
+        if func(fd, 0, 0, length) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+    return fallocate
+
+
+_fallocate = _find_fallocate()
+
+
+def _preallocate(out, size, log):
+    """
+    Reserves 'size' bytes for out before writing, so the filesystem can
+    allocate contiguous extents up front instead of growing the file write by
+    write. Running out of space is reported immediately; filesystems without
+    native preallocation are skipped, never emulated by writing zeros.
+    """
+    if _fallocate is None:
+        return
+    try:
+        _fallocate(out.fileno(), size)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+        log.debug("Preallocation unavailable for %s (%s)", out.name, errno.errorcode.get(e.errno, e.errno))
+
+
+def _kernel_copy(infile, out, offset, size, log, allow_reflink=True):
+    """
+    Copies up to 'size' bytes starting from 'offset' in infile to out without
+    passing them through userspace (copy_file_range, then sendfile).
+    copy_file_range may share extents on some filesystems, so it is skipped
+    when 'allow_reflink' is False.
+    Returns the number of bytes copied; this is less than 'size' on EOF or
+    when neither system call is usable for this pair of files.
+    """
+    src, dst = infile.fileno(), out.fileno()
+    copiers = []
+    if allow_reflink and hasattr(os, 'copy_file_range'):
+        copiers.append(('copy_file_range', lambda pos, count: os.copy_file_range(src, dst, count, pos)))
+    if hasattr(os, 'sendfile'):
+        copiers.append(('sendfile', lambda pos, count: os.sendfile(dst, src, pos, count)))
+
+    copied = 0
+    for name, copy in copiers:
+        try:
+            while copied < size:
+                n = copy(offset + copied, size - copied)
+                if n == 0: # EOF
+                    return copied
+                copied += n
+            return copied
+        except OSError as e:
+            # e.g. EXDEV (cross-device), EINVAL/EOPNOTSUPP (unsupported filesystem),
+            # ENOTSOCK (sendfile on platforms requiring a socket target)
+            log.debug("%s unavailable for %s (%s), falling back", name, out.name, errno.errorcode.get(e.errno, e.errno))
+    return copied
+
+
+def _fadvise(fd, offset, length, advice):
+    """Issues posix_fadvise(advice) where the platform supports it; a hint only, errors are ignored."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, getattr(os, advice))
+    except OSError:
+        pass
+
+
+def _scan_one(input_path, last_chunk_name, verbose):
+    """
+    First stage of processing a file: opens the input and calculates its size.
+
+    Returns:
+        tuple: (infile, size) with the input left open for _save_one(),
+        or (None, 0) if there is nothing to save.
+    """
+    log = logging.getLogger(__name__)
+    log.info("\n--- Processing %s ---", input_path.name)
+    
+    infile = None
+    try:
+        infile = input_path.open('rb')
+
+        # mmap cannot map an empty file
+        file_size = os.fstat(infile.fileno()).st_size
+        if file_size == 0:
+            log.error("Input file is empty: %s. File not saved.", input_path.name)
+        else:
+            # Calculate the correct file size by walking the mapped atom headers
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Start async readahead of the header-bearing region while we parse, but only
+                # for inputs starting with an ftyp atom: anything else is rejected at byte 8
+                if mm[4:8] == b'ftyp':
+                    _fadvise(infile.fileno(), 0, min(file_size, PREFETCH_SIZE), 'POSIX_FADV_WILLNEED')
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                size = CR3_size(mm,
+                                last_chunk_name=last_chunk_name,
+                                log=FileLogAdapter(log, {'name': input_path.name}))
+
+            if size > 0:
+                return infile, size
+            log.error("Failed to determine a valid CR3 structure and size for %s. File not saved.", input_path.name)
+
+    except FileNotFoundError:
+        # Should not happen if scandir worked, but good safeguard
+        log.critical("Input file not found (unexpected): %s", input_path.name)
+    except Exception as e:
+        log.critical("An unexpected error occurred during processing %s: %s", input_path.name, e, exc_info=verbose)
+
+    if infile is not None:
+        # Rejected inputs are not read again either: drop what the parse pulled into the page cache
+        _fadvise(infile.fileno(), 0, 0, 'POSIX_FADV_DONTNEED')
+        infile.close()
+    return None, 0
+
+
+def _save_one(infile, output_path, size, verbose, force_copy=False):
+    """
+    Second stage of processing a file: saves the first 'size' bytes of the
+    input opened by _scan_one() and closes it.
+
+    Returns:
+        int: 1 if the file was saved, 0 otherwise.
+    """
+    log = logging.getLogger(__name__)
+    
+    with infile:
+        try:
+            # Nothing to cut off: an input that is already correct is linked instead of copied
+            if not force_copy and size == os.fstat(infile.fileno()).st_size:
+                try:
+                    os.link(infile.name, output_path)
+                    log.info("[SUCCESS] %s is already correct (%s B): linked to the input", output_path.name, format(size, ',d'))
+                    return 1
+                except FileExistsError:
+                    log.warning("%s already exists: skipping save attempt.", output_path.name)
+                    return 0
+                except OSError as e:
+                    # e.g. EXDEV (output on another filesystem) or no hard links (FAT/exFAT)
+                    log.debug("Hard link unavailable for %s (%s), copying", output_path.name, errno.errorcode.get(e.errno, e.errno))
+
+            # The copy reads [0, size) front to back: ask for large readahead windows
+            _fadvise(infile.fileno(), 0, size, 'POSIX_FADV_SEQUENTIAL')
+
+            return int(restore(infile, output_path, 0, size, log, force_copy))
+        except Exception as e:
+            log.critical("An unexpected error occurred during saving %s: %s", output_path.name, e, exc_info=verbose)
+            return 0
+        finally:
+            # Batch runs never re-read an input, whether it was linked, skipped or copied:
+            # keep it from evicting the user's working set
+            _fadvise(infile.fileno(), 0, 0, 'POSIX_FADV_DONTNEED')
+
+
+def _process_one(input_path, output_path, last_chunk_name, verbose, force_copy=False):
+    """
+    Calculates the size of a single input file and saves the carved result.
+    Lives at module scope so it can be dispatched to worker processes.
+
+    Returns:
+        int: 1 if the file was saved, 0 otherwise.
+    """
+    infile, size = _scan_one(input_path, last_chunk_name, verbose)
+    if infile is None:
+        return 0
+    return _save_one(infile, output_path, size, verbose, force_copy)
+
+
 # --- Application Class ---
 
 class Application:
@@ -120,98 +499,149 @@ class Application:
         self.input_dir = args.input_dir
         self.output_dir = args.output_dir
         self.last_chunk_name = args.lastchunk
+        self.jobs = args.jobs
 
     def run(self):
         """Executes the file fixing process on all files in the input directory."""
-        self.log.info(f"Analyzing files in input directory: {self.input_dir}")
-
-        processed_count = 0
-        
-        # Iterate over all items in the input directory
-        for input_path in self.input_dir.iterdir():
-            # Skip non-files (directories, symlinks, etc.)
-            if not input_path.is_file():
-                self.log.debug(f"Skipping non-file object: {input_path.name}")
-                continue
+        if self.args.source_image:
+            return self.run_image()
 
-            # Define the output path for the current file
-            output_path = self.output_dir / input_path.name
+        self.log.info("Analyzing files in input directory: %s", self.input_dir)
 
-            # Check if output already exists (to prevent overwriting)
-            if output_path.exists():
-                self.log.warning(f"Output file already exists: {output_path.name}. Skipping.")
-                continue
-
-            self.log.info(f"\n--- Processing {input_path.name} ---")
-            
-            try:
-                with input_path.open('rb') as infile:
-                    start_offset = 0
-                    infile.seek(start_offset)
-                    
-                    # 1. Calculate the correct file size
-                    size = CR3_size(infile, 
-                                    last_chunk_name=self.last_chunk_name, 
-                                    log=self.log)
-
-                    if size > 0:
-                        # 2. Restore/save the file
-                        # Pass the specific output path to restore
-                        self.restore(infile, output_path, start_offset, size)
-                        processed_count += 1
-                    else:
-                        self.log.error(f"Failed to determine a valid CR3 structure and size for {input_path.name}. File not saved.")
-
-            except FileNotFoundError:
-                # Should not happen if iterdir worked, but good safeguard
-                self.log.critical(f"Input file not found (unexpected): {input_path.name}")
-            except Exception as e:
-                self.log.critical(f"An unexpected error occurred during processing {input_path.name}: {e}", exc_info=self.args.verbose)
+        input_paths = []
+        output_paths = []
         
-        self.log.info(f"\n--- Batch Processing Complete. {processed_count} files successfully saved. ---")
-
-    def restore(self, infile, output_path, offset, size):
-        """Reads 'size' bytes starting from 'offset' and writes to the output file."""
-        path = output_path
+        # Iterate over all items in the input directory; scandir exposes the
+        # entry type from the directory listing itself, without a stat per entry
+        with os.scandir(self.input_dir) as entries:
+            for entry in entries:
+                input_path = Path(entry.path)
+
+                # Skip non-files (directories, symlinks, etc.)
+                if not entry.is_file(follow_symlinks=False):
+                    self.log.debug("Skipping non-file object: %s", input_path.name)
+                    continue
+
+                # Define the output path for the current file
+                output_path = self.output_dir / input_path.name
+
+                # Check if output already exists (to prevent overwriting);
+                # restore() re-checks atomically when publishing the file
+                if os.path.lexists(output_path):
+                    self.log.warning("Output file already exists: %s. Skipping.", output_path.name)
+                    continue
+
+                input_paths.append(input_path)
+                output_paths.append(output_path)
+
+        # Files are independent of each other, so spread them over worker processes
+        if self.jobs > 1 and len(input_paths) > 1:
+            processed_count = self._run_parallel(input_paths, output_paths)
+        else:
+            processed_count = self._run_pipelined(input_paths, output_paths)
         
-        if path.exists():
-            # Already checked in run(), but kept for internal robustness
-            self.log.warning(f"{path.name} already exists: skipping save attempt.")
-            return
-
-        infile.seek(offset)
-        bufsize = 8 * MB
-        self.log.info(f"Saving {path.name}, calculated size {size:,d} B")
+        self.log.info("\n--- Batch Processing Complete. %d files successfully saved. ---", processed_count)
+
+    def _run_parallel(self, input_paths, output_paths):
+        """
+        Processes the files in a pool of worker processes. A file whose worker
+        raises is logged and the batch goes on. A worker that dies outright (e.g.
+        SIGBUS reading a mapped file on damaged media) breaks the whole pool; the
+        files not saved by then are listed so the batch can be re-run.
+        """
+        processed_count = 0
+        failed = []
+        lost = []
+        with ProcessPoolExecutor(max_workers=self.jobs,
+                                 initializer=setup_logger,
+                                 initargs=(self.args.verbose,)) as ex:
+            futures = {ex.submit(_process_one, input_path, output_path, self.last_chunk_name,
+                                 self.args.verbose, self.args.copy): (input_path, output_path)
+                       for input_path, output_path in zip(input_paths, output_paths)}
+            for future in as_completed(futures):
+                input_path, output_path = futures[future]
+                try:
+                    processed_count += future.result()
+                except BrokenProcessPool:
+                    lost.append((input_path, output_path))
+                except Exception as e:
+                    self.log.error("Failed to process %s: %s", input_path.name, e)
+                    failed.append(input_path)
+
+        if lost:
+            self.log.error("A worker process terminated abruptly (e.g. a read error on damaged media); the remaining files were not processed.")
+            # Results still in flight are lost with the pool, but outputs are only
+            # ever published complete, so one that exists once the workers are gone was saved
+            for input_path, output_path in lost:
+                if os.path.lexists(output_path):
+                    processed_count += 1
+                    continue
+                failed.append(input_path)
+                # A save cut short keeps its temporary file, which would block the re-run
+                tmp = Path(str(output_path) + ".tmp")
+                if os.path.lexists(tmp):
+                    self.log.warning("Interrupted save left %s behind; remove it before re-running.", tmp.name)
+        if failed:
+            self.log.error("%d files were not processed (re-run to retry them): %s", len(failed),
+                           ', '.join(sorted(path.name for path in failed)))
+        return processed_count
+
+    def _run_pipelined(self, input_paths, output_paths):
+        """
+        Processes the files in this process, saving file N on a background thread
+        while the next file is parsed. The copy system calls release the GIL,
+        so parsing and copying overlap. Saves run one at a time, keeping the
+        disk access sequential.
+        """
+        processed_count = 0
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            for input_path, output_path in zip(input_paths, output_paths):
+                infile, size = _scan_one(input_path, self.last_chunk_name, self.args.verbose)
+                if infile is None:
+                    continue
+
+                # Bound the parsed files queued behind the running save (open files, disk queue)
+                if len(pending) >= MAX_PENDING_SAVES:
+                    processed_count += pending.popleft().result()
+                pending.append(pool.submit(_save_one, infile, output_path, size, self.args.verbose, self.args.copy))
+
+            processed_count += sum(future.result() for future in pending)
+        return processed_count
+
+    def run_image(self):
+        """
+        Carves the CR3 files starting at each listed offset out of a single source image.
+        The image is opened and mapped once for the whole batch instead of once per file.
+        """
+        image = self.args.source_image
+        self.log.info("Analyzing %d offsets in source image: %s", len(self.args.offsets), image)
 
-        # Use a temporary file first for robust (atomic) write
-        tmp = Path(str(path) + ".tmp")
-        try:
-            with tmp.open('wb') as out:
-                bytes_remaining = size
-                while bytes_remaining > 0:
-                    k = min(bufsize, bytes_remaining)
-                    buf = infile.read(k)
-                    
-                    if not buf:
-                        self.log.error(f"Premature EOF encountered while reading {size:,d} B for {path.name}")
-                        break
-                    
-                    out.write(buf)
-                    bytes_remaining -= len(buf)
-
-            if bytes_remaining == 0:
-                # Rename temp file to final path on successful write
-                tmp.rename(path)
-                self.log.info(f"[SUCCESS] File successfully fixed and saved to {path.name}")
-            else:
-                self.log.error(f"[ERROR] Incomplete save for {path.name}. Saved only {size - bytes_remaining:,d} bytes.")
-                if tmp.exists():
-                    os.remove(tmp) # Clean up failed temp file
+        processed_count = 0
+        with image.open('rb') as infile, \
+                mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in self.args.offsets:
+                output_path = self.output_dir / f"{image.stem}_{offset}.CR3"
+
+                # Check if output already exists (to prevent overwriting)
+                if os.path.lexists(output_path):
+                    self.log.warning("Output file already exists: %s. Skipping.", output_path.name)
+                    continue
+
+                self.log.info("\n--- Processing %s (offset %s) ---", output_path.name, format(offset, ',d'))
+                try:
+                    size = CR3_size(mm,
+                                    last_chunk_name=self.last_chunk_name,
+                                    log=FileLogAdapter(self.log, {'name': output_path.name}),
+                                    start=offset)
+                    if size > 0:
+                        processed_count += restore(infile, output_path, offset, size, self.log, self.args.copy)
+                    else:
+                        self.log.error("Failed to determine a valid CR3 structure and size at offset %s. File not saved.", format(offset, ',d'))
+                except Exception as e:
+                    self.log.critical("An unexpected error occurred during processing offset %s: %s", format(offset, ',d'), e, exc_info=self.args.verbose)
 
-        except Exception as e:
-            self.log.critical(f"Error restoring file {path.name}: {e}")
-            if tmp.exists():
-                os.remove(tmp) # Clean up failed temp file
+        self.log.info("\n--- Batch Processing Complete. %d files successfully saved. ---", processed_count)
 
 
 # --- CLI and Setup ---
@@ -220,11 +650,19 @@ def parse_args():
     """Parses command line arguments."""
     p = argparse.ArgumentParser(description="Fixes Canon CR3 files in batch mode by calculating their true size via atom parsing and carving the correct data.")
 
-    p.add_argument('--input-dir',
+    source = p.add_mutually_exclusive_group(required=True)
+    source.add_argument('--input-dir',
                     type=Path,
-                    required=True,
                     help="Path to the input directory containing files to be fixed.",
                     metavar="INPUT_DIR")
+    source.add_argument('--source-image',
+                    type=Path,
+                    help="Path to a single disk image holding the CR3 files to carve at the offsets given by --offsets-file.",
+                    metavar="IMAGE")
+    p.add_argument('--offsets-file',
+                    type=Path,
+                    help="Text file listing the start offset of each CR3 file in --source-image, one per line (decimal or 0x-prefixed hex).",
+                    metavar="OFFSETS")
     p.add_argument('--output-dir',
                     type=Path,
                     required=True,
@@ -239,6 +677,15 @@ def parse_args():
                     default='mdat',
                     metavar="NAME",
                     help="Name of the last chunk to include (e.g., 'mdat' for full file). [default '%(default)s']")
+    p.add_argument('-j', '--jobs',
+                    type=int,
+                    default=os.cpu_count() or 1,
+                    metavar="N",
+                    help="Number of files to process in parallel worker processes. [default %(default)s]")
+    p.add_argument('--copy',
+                    action="store_true",
+                    default=False,
+                    help="Always write an independent physical copy: the output is never a hard link to, or a copy-on-write clone of, the input.")
 
     args = p.parse_args()
     
@@ -247,9 +694,26 @@ def parse_args():
     if not args.lastchunk:
         p.error("--lastchunk must not be empty")
 
-    # Validate input directory
-    if not args.input_dir.exists() or not args.input_dir.is_dir():
-        p.error(f"Input path must be an existing directory: {args.input_dir}")
+    if args.jobs < 1:
+        p.error("--jobs must be at least 1")
+
+    if args.source_image:
+        # Validate source image and read its offsets
+        if not args.source_image.is_file() or args.source_image.stat().st_size == 0:
+            p.error(f"Source image must be an existing, non-empty file: {args.source_image}")
+        if not args.offsets_file:
+            p.error("--offsets-file is required with --source-image")
+        try:
+            args.offsets = read_offsets(args.offsets_file)
+        except (OSError, ValueError) as e:
+            p.error(f"Could not read offsets file {args.offsets_file}: {e}")
+    else:
+        if args.offsets_file:
+            p.error("--offsets-file can only be used with --source-image")
+
+        # Validate input directory
+        if not args.input_dir.exists() or not args.input_dir.is_dir():
+            p.error(f"Input path must be an existing directory: {args.input_dir}")
 
     # Create output directory if it doesn't exist
     try:
@@ -260,13 +724,33 @@ def parse_args():
     return args
 
 
+def read_offsets(path):
+    """
+    Reads one byte offset per line (decimal or 0x-prefixed hex).
+    Blank lines and '#' comments are ignored.
+    """
+    offsets = []
+    with open(path) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            offset = int(line, 16) if line.lower().startswith('0x') else int(line)
+            if offset < 0:
+                raise ValueError(f"negative offset: {line}")
+            offsets.append(offset)
+    return offsets
+
+
 def setup_logger(verbose=False):
     """Sets up the global logger."""
     log = logging.getLogger(__name__)
     log.setLevel(logging.DEBUG if verbose else logging.INFO)
-    ch = logging.StreamHandler()
-    ch.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
-    log.addHandler(ch)
+    # Worker processes may inherit an already configured logger
+    if not log.handlers:
+        ch = logging.StreamHandler()
+        ch.setFormatter(logging.Formatter('[%(levelname)s] %(message)s'))
+        log.addHandler(ch)
     return log
 
 
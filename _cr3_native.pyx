@@ -0,0 +1,69 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Optional native CR3 atom walker.
+
+Implements the same size calculation as CR3_size() in CR3-Repair-Tool.py
+as a tight C loop over the mapped file. Build it in place next to the
+script with:
+
+    cythonize -i _cr3_native.pyx
+
+When the extension is not built, the script uses its pure-Python walker.
+"""
+
+cdef unsigned long long FTYP = 0x66747970 # b'ftyp'
+
+
+cdef inline unsigned long long _be32(const unsigned char* p) nogil:
+    """Reads a big-endian 32-bit integer."""
+    return ((<unsigned long long>p[0] << 24) | (<unsigned long long>p[1] << 16)
+            | (<unsigned long long>p[2] << 8) | <unsigned long long>p[3])
+
+
+cpdef unsigned long long cr3_size(const unsigned char[::1] buf, bytes last_chunk, unsigned long long start=0):
+    """
+    Calculates the total size of the CR3 file by summing atom sizes
+    until the termination atom 'last_chunk' is reached.
+
+    Args:
+        buf (mmap or bytes-like): The mapped contents of the CR3 file.
+        last_chunk (bytes): The name of the final atom to include (e.g., b'mdat').
+        start (int): Offset of the CR3 file within the buffer.
+
+    Returns:
+        int: The total calculated size of the file in bytes, or 0 if invalid structure.
+    """
+    cdef unsigned long long n = buf.shape[0]
+    cdef unsigned long long pos = start, size, header_size, tag, last, total = 0
+    cdef const unsigned char* p
+
+    # Atom names are always 4 bytes: any other name can never match
+    if len(last_chunk) != 4 or start >= n:
+        return 0
+    last = _be32(last_chunk)
+    p = &buf[0]
+
+    with nogil:
+        # Each atom needs at least an 8 byte header (size + name)
+        while pos + 8 <= n:
+            size = _be32(p + pos)
+            tag = _be32(p + pos + 4)
+            header_size = 8
+
+            # Handle 64-bit size extension (size == 1)
+            if size == 1:
+                if pos + 16 > n:
+                    break
+                size = (_be32(p + pos + 8) << 32) | _be32(p + pos + 12)
+                header_size = 16
+
+            # Invalid size (no progress, or past the end of the buffer), or first atom is not ftyp
+            if size < header_size or size > n - pos or (total == 0 and tag != FTYP):
+                break
+
+            total += size
+            if tag == last:
+                return total
+            pos += size
+
+    return 0